@@ -99,9 +99,14 @@ class Log:
 
         return logger
 
+    @staticmethod
+    def is_enabled_for(level) -> bool:
+        """ Checks if a message of given level would be logged """
+        return Log.logger is not None and Log.logger.isEnabledFor(level)
+
     @staticmethod
     def debug(msg, *args, **kwargs):
-        if not Log.logger: return
+        if not Log.is_enabled_for(Log.DEBUG): return
         caller = inspect.stack()[1][3]
         Log.logger.debug(f"[{caller}] {msg}", *args, **kwargs)
 
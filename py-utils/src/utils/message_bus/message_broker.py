@@ -95,8 +95,16 @@ class MessageBroker:
         messages: list):
         pass
 
-    def receive(self, consumer_id: str) -> list:
+    def receive(self, consumer_id: str, timeout: float = None, \
+        batch_size: int = 1, max_wait: float = None) -> list:
+        pass
+
+    async def receive_async(self, consumer_id: str, timeout: float = None, \
+        batch_size: int = 1) -> list:
         pass
 
     def ack(self, consumer_id: str):
         pass
+
+    def close(self):
+        pass
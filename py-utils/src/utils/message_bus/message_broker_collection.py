@@ -17,6 +17,8 @@
 
 import time
 import errno
+import asyncio
+import threading
 
 from cortx.utils.log import Log
 from confluent_kafka import Producer, Consumer, KafkaError, KafkaException
@@ -40,6 +42,50 @@ class KafkaMessageBroker(MessageBroker):
     _max_config_retry_count = 3
     _max_purge_retry_count = 5
     _max_list_message_type_count = 15
+
+    # Backoff (in seconds) while waiting for message type changes to show up
+    _list_retry_initial_delay = 0.05
+    _list_retry_max_delay = 2.0
+
+    # Backoff (in seconds) between consume() calls of receive_async
+    _receive_retry_initial_delay = 0.01
+    _receive_retry_max_delay = 0.1
+
+    # Formatted with the retry count and message type when the wait times out
+    _create_timeout_msg = "Timed out after retry %d while creating " +\
+        "message_type %s."
+    _delete_timeout_msg = "Timed out after %d retry to delete message_type" +\
+        " %s."
+    _concurrency_timeout_msg = "Exceeded retry count %d for creating " +\
+        "partitions for message_type %s."
+
+    # Producer tuning, overridden by message_bus>producer of broker_conf.
+    # linger_ms and batch_num_messages let librdkafka accumulate messages
+    # into a batch, which is then compressed as a whole
+    _default_producer_conf = {
+        'linger_ms': 20,
+        'batch_num_messages': 10000,
+        'compression_type': 'lz4',
+        }
+    _producer_prop_map = {
+        'linger_ms': 'linger.ms',
+        'batch_num_messages': 'batch.num.messages',
+        'compression_type': 'compression.type',
+        'queue_buffering_max_kbytes': 'queue.buffering.max.kbytes',
+        }
+    _produce_buffer_wait = 0.001
+
+    # Seconds for which the topics listed by a client are reused
+    _topic_cache_ttl = 5.0
+
+    # Admin and Producer clients shared by all the client_ids of the process,
+    # keyed by the configuration they are created with
+    _shared_admin = {}
+    _shared_producer = {}
+    # Shared producer key -> (thread serving its callbacks, stop event)
+    _poll_threads = {}
+    _poll_interval = 0.1
+
     _config_prop_map = {
         'expire_time_ms': 'retention.ms',
         'data_limit_bytes': 'segment.bytes',
@@ -49,9 +95,16 @@ class KafkaMessageBroker(MessageBroker):
     def __init__(self, broker_conf: dict):
         """ Initialize Kafka based Configurations """
         super().__init__(broker_conf)
-        Log.debug(f"KafkaMessageBroker: initialized with broker " \
-            f"configurations broker_conf: {broker_conf}")
+        if Log.is_enabled_for(Log.DEBUG):
+            Log.debug(f"KafkaMessageBroker: initialized with broker " \
+                f"configurations broker_conf: {broker_conf}")
         self._clients = {'admin': {}, 'producer': {}, 'consumer': {}}
+        # client_id -> (expiry time, frozenset of topics)
+        self._topic_cache = {}
+        # consumer_id -> True if offsets are committed automatically
+        self._auto_ack = {}
+        # message_type -> retention.ms restored after delete
+        self._saved_retention = {}
 
         # Polling timeout
         self._recv_message_timeout = \
@@ -63,22 +116,52 @@ class KafkaMessageBroker(MessageBroker):
         self._send_message_timeout = \
             broker_conf['message_bus']['send_timeout']
 
+        # Client configurations, copied and completed with client.id per client
+        self._base_kafka_conf = {'bootstrap.servers': self._servers, \
+            'error_cb': self._error_cb}
+        self._admin_kafka_conf = dict(self._base_kafka_conf)
+        self._admin_kafka_conf['socket.timeout.ms'] = \
+            self._controller_socket_timeout
+        self._producer_kafka_conf = dict(self._admin_kafka_conf)
+        self._producer_kafka_conf['message.timeout.ms'] = \
+            self._send_message_timeout
+        producer_conf = dict(self._default_producer_conf)
+        producer_conf.update(broker_conf['message_bus'].get('producer') or {})
+        for key, val in producer_conf.items():
+            if key not in self._producer_prop_map:
+                Log.error(f"MessageBusError: {errno.EINVAL} Invalid " \
+                    f"producer configuration {key}.")
+                raise MessageBusError(errno.EINVAL, "Invalid producer " +\
+                    "configuration %s.", key)
+            self._producer_kafka_conf[self._producer_prop_map[key]] = val
+        self._admin_shared_key = \
+            self._shared_client_key(self._admin_kafka_conf)
+        self._producer_shared_key = \
+            self._shared_client_key(self._producer_kafka_conf)
+
     def init_client(self, client_type: str, **client_conf: dict):
         """ Obtain Kafka based Producer/Consumer """
-        Log.debug(f"initializing client_type: {client_type}," \
-            f" **kwargs {client_conf}")
+        if Log.is_enabled_for(Log.DEBUG):
+            Log.debug(f"initializing client_type: {client_type}," \
+                f" **kwargs {client_conf}")
         # Validate and return if client already exists
-        if client_type not in self._clients.keys():
+        if client_type not in self._clients:
             Log.error(f"MessageBusError: Invalid client type " \
                 f"{errors.ERR_INVALID_CLIENT_TYPE}, {client_type}")
             raise MessageBusError(errors.ERR_INVALID_CLIENT_TYPE, \
                 "Invalid client type %s", client_type)
 
-        if client_conf['client_id'] in self._clients[client_type].keys():
-            if self._clients[client_type][client_conf['client_id']] != {}:
+        if client_conf['client_id'] in self._clients[client_type]:
+            # None if the client is closed, to be created again
+            if self._clients[client_type][client_conf['client_id']] not in \
+                (None, {}):
                 # Check if message_type exists to send/receive
                 client = self._clients[client_type][client_conf['client_id']]
-                available_message_types = client.list_topics().topics.keys()
+                message_types = [client_conf['message_type']] if \
+                    client_type == 'producer' else \
+                    client_conf.get('message_types', [])
+                available_message_types = self._cached_topics(client, \
+                    client_conf['client_id'], message_types)
                 if client_type == 'producer':
                     if client_conf['message_type'] not in \
                         available_message_types:
@@ -97,52 +180,41 @@ class KafkaMessageBroker(MessageBroker):
                             Partition. %s", KafkaError(3))
                 return
 
-        kafka_conf = {}
-        kafka_conf['bootstrap.servers'] = self._servers
-        kafka_conf['client.id'] = client_conf['client_id']
-        kafka_conf['error_cb'] = self._error_cb
-
         if client_type == 'admin' or client_type == 'producer':
-                kafka_conf['socket.timeout.ms'] = self._controller_socket_timeout
+            admin = self._shared_admin.get(self._admin_shared_key)
+            if admin is None:
+                kafka_conf = self._admin_kafka_conf.copy()
+                kafka_conf['client.id'] = client_conf['client_id']
                 admin = AdminClient(kafka_conf)
-                self._clients['admin'][client_conf['client_id']] = admin
+                self._shared_admin[self._admin_shared_key] = admin
+            self._clients['admin'][client_conf['client_id']] = admin
 
         if client_type == 'producer':
-            kafka_conf['message.timeout.ms'] = self._send_message_timeout
-            producer = Producer(**kafka_conf)
+            producer = self._shared_producer.get(self._producer_shared_key)
+            if producer is None:
+                kafka_conf = self._producer_kafka_conf.copy()
+                kafka_conf['client.id'] = client_conf['client_id']
+                producer = Producer(**kafka_conf)
+                self._shared_producer[self._producer_shared_key] = producer
+                self._start_poll_thread(self._producer_shared_key, producer, \
+                    client_conf['client_id'])
             self._clients[client_type][client_conf['client_id']] = producer
 
-            self._resource = ConfigResource('topic', \
-                client_conf['message_type'])
             admin = self._clients['admin'][client_conf['client_id']]
-            conf = admin.describe_configs([self._resource])
-            default_configs = list(conf.values())[0].result()
-            for params in ['retention.ms']:
-                if params not in default_configs:
-                    Log.error(f"MessageBusError: Missing required config" \
-                        f" parameter {params}. for client type {client_type}")
-                    raise MessageBusError(errno.ENOKEY, \
-                        "Missing required config parameter %s. for " +\
-                        "client type %s", params, client_type)
-
-            self._saved_retention = int(default_configs['retention.ms']\
-                .__dict__['value'])
-
-            # Set retention to default if the value is 1 ms
-            self._saved_retention = self._default_msg_retention_period if \
-                self._saved_retention == self._min_msg_retention_period else \
-                int(default_configs['retention.ms'].__dict__['value'])
+            self._save_retention(admin, client_conf['message_type'])
 
         elif client_type == 'consumer':
             for entry in ['offset', 'consumer_group', 'message_types', \
                 'auto_ack', 'client_id']:
-                if entry not in client_conf.keys():
+                if entry not in client_conf:
                     Log.error(f"MessageBusError: Could not find entry "\
                         f"{entry} in conf keys for client type {client_type}")
                     raise MessageBusError(errno.ENOENT, "Could not find " +\
                         "entry %s in conf keys for client type %s", entry, \
                         client_type)
 
+            kafka_conf = self._base_kafka_conf.copy()
+            kafka_conf['client.id'] = client_conf['client_id']
             kafka_conf['enable.auto.commit'] = client_conf['auto_ack']
             kafka_conf['auto.offset.reset'] = client_conf['offset']
             kafka_conf['group.id'] = client_conf['consumer_group']
@@ -150,6 +222,53 @@ class KafkaMessageBroker(MessageBroker):
             consumer = Consumer(**kafka_conf)
             consumer.subscribe(client_conf['message_types'])
             self._clients[client_type][client_conf['client_id']] = consumer
+            self._auto_ack[client_conf['client_id']] = \
+                str(client_conf['auto_ack']).lower() == 'true'
+
+    def _save_retention(self, admin: object, message_type: str):
+        """ Saves retention of message type, to be restored after delete """
+        conf = admin.describe_configs([ConfigResource('topic', message_type)])
+        default_configs = list(conf.values())[0].result()
+        for params in ['retention.ms']:
+            if params not in default_configs:
+                Log.error(f"MessageBusError: Missing required config" \
+                    f" parameter {params}. for message type {message_type}")
+                raise MessageBusError(errno.ENOKEY, \
+                    "Missing required config parameter %s. for " +\
+                    "message type %s", params, message_type)
+
+        saved_retention = int(default_configs['retention.ms'].value)
+        # Set retention to default if the value is 1 ms
+        if saved_retention == self._min_msg_retention_period:
+            saved_retention = self._default_msg_retention_period
+        self._saved_retention[message_type] = saved_retention
+
+    @staticmethod
+    def _shared_client_key(kafka_conf: dict) -> tuple:
+        """ Key of a shared client, i.e. its config apart from the identity """
+        return tuple(sorted((key, val) for key, val in kafka_conf.items() \
+            if key not in ('client.id', 'error_cb')))
+
+    def _cached_topics(self, client: object, client_id: str, \
+        message_types: list, ttl: float = None) -> frozenset:
+        """
+        Topics known to the client, listed again once ttl expires or when
+        none of message_types is cached (it may be created by other process)
+        """
+        if ttl is None:
+            ttl = self._topic_cache_ttl
+        now = time.monotonic()
+        cached = self._topic_cache.get(client_id)
+        if cached is not None and cached[0] > now and (not message_types or \
+            any(message_type in cached[1] for message_type in message_types)):
+            return cached[1]
+        topics = frozenset(client.list_topics().topics)
+        self._topic_cache[client_id] = (now + ttl, topics)
+        return topics
+
+    def _invalidate_topic_cache(self):
+        """ Drops cached topics, to be called when topics are changed """
+        self._topic_cache.clear()
 
     def _task_status(self, tasks: dict, method: str):
         """ Check if the task is completed successfully """
@@ -162,11 +281,19 @@ class KafkaMessageBroker(MessageBroker):
                 raise MessageBusError(errors.ERR_OP_FAILED, \
                     "Admin operation fails for %s. %s", method, e)
 
-    def _get_metadata(self, admin: object):
-        """ To get the metadata information of message type """
+    def _get_metadata(self, admin: object, message_type: str = None):
+        """
+        To get the metadata information of message types, only the given
+        message_type is fetched (if it exists) when specified
+        """
         try:
-            message_type_metadata = admin.list_topics().__dict__
-            return message_type_metadata['topics']
+            if message_type is None:
+                return admin.list_topics().topics
+            message_type_metadata = admin.list_topics(topic=message_type, \
+                timeout=self._controller_socket_timeout/1000)
+            # Unknown topic is reported as an entry with error
+            return {name: metadata for name, metadata in \
+                message_type_metadata.topics.items() if not metadata.error}
         except KafkaException as e:
             Log.error(f"MessageBusError: {errors.ERR_OP_FAILED}. " \
                 f"list_topics() failed. {e} Check if Kafka service is " \
@@ -180,6 +307,52 @@ class KafkaMessageBroker(MessageBroker):
             raise MessageBusError(errors.ERR_OP_FAILED, "list_topics() " + \
                 "failed. %s. Check if Kafka service is running successfully", e)
 
+    def _wait_until(self, predicate, message_type: str, err_no: int, \
+        err_msg: str, *args):
+        """
+        Retries predicate(message_type, *args) with exponential backoff and
+        raises err_msg if it does not hold within _max_list_message_type_count
+        retries
+        """
+        delay = self._list_retry_initial_delay
+        for list_retry in range(self._max_list_message_type_count):
+            if predicate(message_type, *args):
+                return
+            Log.debug(f"Waiting {delay}s for {message_type}, retry " \
+                f"{list_retry}")
+            time.sleep(delay)
+            delay = min(delay*2, self._list_retry_max_delay)
+        if not predicate(message_type, *args):
+            self._raise_wait_timeout(message_type, err_no, err_msg)
+
+    async def _wait_until_async(self, predicate, message_type: str, \
+        err_no: int, err_msg: str, *args):
+        """ Same as _wait_until, without blocking the event loop """
+        delay = self._list_retry_initial_delay
+        for list_retry in range(self._max_list_message_type_count):
+            if await self._run_blocking(predicate, message_type, *args):
+                return
+            Log.debug(f"Waiting {delay}s for {message_type}, retry " \
+                f"{list_retry}")
+            await asyncio.sleep(delay)
+            delay = min(delay*2, self._list_retry_max_delay)
+        if not await self._run_blocking(predicate, message_type, *args):
+            self._raise_wait_timeout(message_type, err_no, err_msg)
+
+    def _raise_wait_timeout(self, message_type: str, err_no: int, \
+        err_msg: str):
+        """ err_msg is formatted with the retry count and message_type """
+        Log.error(f"MessageBusError: {err_no} " + err_msg, \
+            self._max_list_message_type_count, message_type)
+        raise MessageBusError(err_no, err_msg, \
+            self._max_list_message_type_count, message_type)
+
+    @staticmethod
+    async def _run_blocking(func, *args):
+        """ Runs a blocking librdkafka call in the default executor """
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, func, *args)
+
     @staticmethod
     def _error_cb(err):
         """ Callback to check if all brokers are down """
@@ -198,7 +371,23 @@ class KafkaMessageBroker(MessageBroker):
         Returns list of message types e.g. ["topic1", "topic2", ...]
         """
         admin = self._clients['admin'][admin_id]
-        return list(self._get_metadata(admin).keys())
+        return list(self._get_metadata(admin))
+
+    def _create_message_types(self, admin_id: str, message_types: list, \
+        partitions: int) -> object:
+        """ Requests creation of message types, returns the admin used """
+        if Log.is_enabled_for(Log.DEBUG):
+            Log.debug(f"Register message type {message_types} using " \
+                f"{admin_id} with {partitions} partitions")
+        admin = self._clients['admin'][admin_id]
+        new_message_type = [NewTopic(each_message_type, \
+            num_partitions=partitions) for each_message_type in message_types]
+        created_message_types = admin.create_topics(new_message_type)
+        self._task_status(created_message_types, method='register_message_type')
+        return admin
+
+    def _is_message_type_created(self, message_type: str, admin: object):
+        return message_type in self._get_metadata(admin, message_type)
 
     def register_message_type(self, admin_id: str, message_types: list, \
         partitions: int):
@@ -212,29 +401,39 @@ class KafkaMessageBroker(MessageBroker):
         partitions      Integer that represents number of partitions to be
                         created.
         """
-        Log.debug(f"Register message type {message_types} using {admin_id}" \
-            f" with {partitions} partitions")
+        admin = self._create_message_types(admin_id, message_types, partitions)
+        for each_message_type in message_types:
+            self._wait_until(self._is_message_type_created, each_message_type, \
+                errno.ETIMEDOUT, self._create_timeout_msg, admin)
+        self._invalidate_topic_cache()
+
+    async def register_message_type_async(self, admin_id: str, \
+        message_types: list, partitions: int):
+        """ Creates a list of message types, see register_message_type """
+        admin = await self._run_blocking(self._create_message_types, \
+            admin_id, message_types, partitions)
+        for each_message_type in message_types:
+            await self._wait_until_async(self._is_message_type_created, \
+                each_message_type, errno.ETIMEDOUT, self._create_timeout_msg, \
+                admin)
+        self._invalidate_topic_cache()
+
+    def _delete_message_types(self, admin_id: str, \
+        message_types: list) -> object:
+        """ Requests deletion of message types, returns the admin used """
+        if Log.is_enabled_for(Log.DEBUG):
+            Log.debug(f"Deregister message type {message_types} using " \
+                f"{admin_id}")
         admin = self._clients['admin'][admin_id]
-        new_message_type = [NewTopic(each_message_type, \
-            num_partitions=partitions) for each_message_type in message_types]
-        created_message_types = admin.create_topics(new_message_type)
-        self._task_status(created_message_types, method='register_message_type')
+        deleted_message_types = admin.delete_topics(message_types)
+        self._task_status(deleted_message_types, \
+            method='deregister_message_type')
+        return admin
 
-        for each_message_type in message_types:
-            for list_retry in range(1, self._max_list_message_type_count+2):
-                if each_message_type not in \
-                    list(self._get_metadata(admin).keys()):
-                    if list_retry > self._max_list_message_type_count:
-                        Log.error(f"MessageBusError: Timed out after retry " \
-                            f"{list_retry} while creating message_type " \
-                            f"{each_message_type}")
-                        raise MessageBusError(errno.ETIMEDOUT, "Timed out " +\
-                            "after retry %d while creating message_type %s.", \
-                            list_retry, each_message_type)
-                    time.sleep(list_retry*1)
-                    continue
-                else:
-                    break
+    def _is_message_type_deleted(self, message_type: str, admin: object):
+        # Metadata of all message types is listed here, as requesting a
+        # deleted topic by name may get it auto created by the broker
+        return message_type not in self._get_metadata(admin)
 
     def deregister_message_type(self, admin_id: str, message_types: list):
         """
@@ -245,26 +444,41 @@ class KafkaMessageBroker(MessageBroker):
         message_types   This is essentially equivalent to the list of
                         queue/topic name. For e.g. ["Alert"]
         """
-        Log.debug(f"Deregister message type {message_types} using {admin_id}")
+        admin = self._delete_message_types(admin_id, message_types)
+        for each_message_type in message_types:
+            self._wait_until(self._is_message_type_deleted, each_message_type, \
+                errno.ETIMEDOUT, self._delete_timeout_msg, admin)
+        self._invalidate_topic_cache()
+
+    async def deregister_message_type_async(self, admin_id: str, \
+        message_types: list):
+        """ Deletes a list of message types, see deregister_message_type """
+        admin = await self._run_blocking(self._delete_message_types, \
+            admin_id, message_types)
+        for each_message_type in message_types:
+            await self._wait_until_async(self._is_message_type_deleted, \
+                each_message_type, errno.ETIMEDOUT, self._delete_timeout_msg, \
+                admin)
+        self._invalidate_topic_cache()
+
+    def _create_partitions(self, admin_id: str, message_type: str, \
+        concurrency_count: int) -> object:
+        """ Requests increase of partitions, returns the admin used """
+        Log.debug(f"Adding concurrency count {concurrency_count} for message" \
+            f" type {message_type} with admin id {admin_id}")
         admin = self._clients['admin'][admin_id]
-        deleted_message_types = admin.delete_topics(message_types)
-        self._task_status(deleted_message_types, \
-            method='deregister_message_type')
+        new_partition = [NewPartitions(message_type, \
+            new_total_count=concurrency_count)]
+        partitions = admin.create_partitions(new_partition)
+        self._task_status(partitions, method='add_concurrency')
+        return admin
 
-        for each_message_type in message_types:
-            for list_retry in range(1, self._max_list_message_type_count+2):
-                if each_message_type in list(self._get_metadata(admin).keys()):
-                    if list_retry > self._max_list_message_type_count:
-                        Log.error(f"MessageBusError: Timed out after " \
-                            f"{list_retry} retry to delete message_type " \
-                            f"{each_message_type}")
-                        raise MessageBusError(errno.ETIMEDOUT, \
-                            "Timed out after %d retry to delete message_type" +\
-                            "%s.", list_retry, each_message_type)
-                    time.sleep(list_retry*1)
-                    continue
-                else:
-                    break
+    def _is_concurrency_added(self, message_type: str, admin: object, \
+        concurrency_count: int):
+        # Topic is left out of metadata while it has an error, retry then
+        metadata = self._get_metadata(admin, message_type).get(message_type)
+        return metadata is not None and \
+            len(metadata.partitions) == concurrency_count
 
     def add_concurrency(self, admin_id: str, message_type: str, \
         concurrency_count: int):
@@ -281,40 +495,72 @@ class KafkaMessageBroker(MessageBroker):
         Note:  Number of partitions for a message type can only be increased,
                never decreased
         """
-        Log.debug(f"Adding concurrency count {concurrency_count} for message" \
-            f" type {message_type} with admin id {admin_id}")
-        admin = self._clients['admin'][admin_id]
-        new_partition = [NewPartitions(message_type, \
-            new_total_count=concurrency_count)]
-        partitions = admin.create_partitions(new_partition)
-        self._task_status(partitions, method='add_concurrency')
-
+        admin = self._create_partitions(admin_id, message_type, \
+            concurrency_count)
         # Waiting for few seconds to complete the partition addition process
-        for list_retry in range(1, self._max_list_message_type_count+2):
-            if concurrency_count != len(self._get_metadata(admin)\
-                [message_type].__dict__['partitions']):
-                if list_retry > self._max_list_message_type_count:
-                    Log.error(f"MessageBusError: Exceeded retry count " \
-                        f"{list_retry} for creating partitions for " \
-                        f"message_type {message_type}")
-                    raise MessageBusError(errno.E2BIG, "Exceeded retry count" +\
-                        " %d for creating partitions for message_type" +\
-                        " %s.", list_retry, message_type)
-                time.sleep(list_retry*1)
-                continue
-            else:
-                break
+        self._wait_until(self._is_concurrency_added, message_type, \
+            errno.E2BIG, self._concurrency_timeout_msg, admin, \
+            concurrency_count)
+        Log.debug(f"Successfully Increased the partitions for a " \
+            f"{message_type} to {concurrency_count}")
+
+    async def add_concurrency_async(self, admin_id: str, message_type: str, \
+        concurrency_count: int):
+        """ Increases the partitions for a message type, see add_concurrency """
+        admin = await self._run_blocking(self._create_partitions, admin_id, \
+            message_type, concurrency_count)
+        await self._wait_until_async(self._is_concurrency_added, message_type, \
+            errno.E2BIG, self._concurrency_timeout_msg, admin, \
+            concurrency_count)
         Log.debug(f"Successfully Increased the partitions for a " \
             f"{message_type} to {concurrency_count}")
 
+    def _start_poll_thread(self, shared_key: tuple, producer: object, \
+        client_id: str):
+        """ Starts a daemon thread serving delivery callbacks of producer """
+        stop_event = threading.Event()
+        poll_thread = threading.Thread(target=self._poll_loop, \
+            args=(producer, stop_event), name=f"kafka_poll_{client_id}", \
+            daemon=True)
+        poll_thread.start()
+        self._poll_threads[shared_key] = (poll_thread, stop_event)
+
+    @staticmethod
+    def _poll_loop(producer: object, stop_event: threading.Event):
+        """ Polls producer until stop_event is set """
+        while not stop_event.is_set():
+            producer.poll(KafkaMessageBroker._poll_interval)
+
+    def close(self):
+        """
+        Stops the poll threads after flushing the producers. Existing
+        producer clients are not initialized anymore until init_client is
+        called again for them
+        """
+        for shared_key, (poll_thread, stop_event) in \
+            list(self._poll_threads.items()):
+            stop_event.set()
+            poll_thread.join()
+            producer = self._shared_producer.pop(shared_key, None)
+            if producer is not None:
+                producer.flush(self._send_message_timeout/1000)
+            del self._poll_threads[shared_key]
+        for producer_id in self._clients['producer']:
+            self._clients['producer'][producer_id] = None
+
     @staticmethod
     def delivery_callback(err, _):
+        """
+        Delivery callback of async messages. It is served while polling the
+        producer shared by all the clients and nobody waits for the result,
+        so failures are logged instead of raised
+        """
         if err:
-            raise MessageBusError(errno.ETIMEDOUT, "Message delivery failed. \
-                %s", err)
+            Log.error(f"MessageBusError: {errno.ETIMEDOUT} Message delivery " \
+                f"failed. {err}")
 
     def send(self, producer_id: str, message_type: str, method: str, \
-        messages: list, timeout=0.1):
+        messages: list):
         """
         Sends list of messages to Kafka cluster(s)
 
@@ -323,10 +569,16 @@ class KafkaMessageBroker(MessageBroker):
         message_type    This is essentially equivalent to the
                         queue/topic name. For e.g. "Alert"
         method          Can be set to "sync" or "async"(default).
-        messages        A list of messages sent to Kafka Message Server
+        messages        A list of messages sent to Kafka Message Server. str
+                        messages are utf-8 encoded, bytes like messages are
+                        sent as is, so pre-encode payloads that are reused
+
+        All the messages are queued first and delivered as a batch, "sync"
+        waits (upto send_timeout) for the whole batch to be delivered.
+        Delivery of "async" messages is served by the producer poll thread.
         """
-        Log.debug(f"Producer {producer_id} sending list of messages " \
-            f"{messages} of message type {message_type} to kafka server" \
+        Log.debug(f"Producer {producer_id} sending {len(messages)} " \
+            f"messages of message type {message_type} to kafka server" \
             f" with method {method}")
         producer = self._clients['producer'][producer_id]
         if producer is None:
@@ -336,15 +588,92 @@ class KafkaMessageBroker(MessageBroker):
             raise MessageBusError(errors.ERR_SERVICE_NOT_INITIALIZED,\
                 "Producer %s is not initialized", producer_id)
 
+        delivery_errors = []
+        if method == 'sync':
+            # Producer is shared, so track only the messages of this call.
+            # Callbacks run on the poll thread, hence the lock
+            pending = [len(messages)]
+            pending_lock = threading.Lock()
+            delivered = threading.Event()
+            if not messages:
+                delivered.set()
+
+            def delivery_callback(err, _):
+                with pending_lock:
+                    if err:
+                        delivery_errors.append(err)
+                    pending[0] -= 1
+                    if pending[0] == 0:
+                        delivered.set()
+        else:
+            delivery_callback = self.delivery_callback
+
         for message in messages:
-            producer.produce(message_type, bytes(message, 'utf-8'), \
-                callback=self.delivery_callback)
-            if method == 'sync':
-                producer.flush()
-            else:
-                producer.poll(timeout=timeout)
+            payload = message if isinstance(message, (bytes, bytearray, \
+                memoryview)) else message.encode('utf-8')
+            while True:
+                try:
+                    producer.produce(message_type, payload, \
+                        callback=delivery_callback)
+                    break
+                except BufferError:
+                    # Local queue is full, wait for deliveries to make room
+                    producer.poll(self._produce_buffer_wait)
+
+        if method == 'sync':
+            delivered.wait(self._send_message_timeout/1000)
+            with pending_lock:
+                remaining = pending[0]
+            if remaining > 0:
+                Log.error(f"MessageBusError: {errno.ETIMEDOUT} {remaining} " \
+                    f"messages of producer {producer_id} not delivered within" \
+                    f" {self._send_message_timeout} ms")
+                raise MessageBusError(errno.ETIMEDOUT, "%d messages of " +\
+                    "producer %s not delivered within %d ms.", remaining, \
+                    producer_id, self._send_message_timeout)
+            if delivery_errors:
+                raise MessageBusError(errno.ETIMEDOUT, "Message delivery " +\
+                    "failed. %s", delivery_errors[0])
         Log.debug("Successfully Sent list of messages to Kafka cluster")
 
+    def _set_retention(self, admin: object, message_type: str, \
+        retention: int, err_no: int, err_msg: str):
+        """ Sets retention.ms of message type, err_msg takes message_type """
+        topic_resource = ConfigResource('topic', message_type, \
+            set_config={'retention.ms': retention})
+        for tuned_retry in range(self._max_config_retry_count):
+            tuned_params = admin.alter_configs([topic_resource])
+            if list(tuned_params.values())[0].result() is not None:
+                if tuned_retry > 1:
+                    Log.error(f"MessageBusError: {err_no} alter_configs() " \
+                        f"for resource {topic_resource} failed using admin " \
+                        f"{admin}. " + err_msg, message_type)
+                    raise MessageBusError(err_no, err_msg, message_type)
+                continue
+            else:
+                break
+
+    def _purge_messages(self, admin_id: str, message_type: str) -> object:
+        """ Sets the minimum retention to purge messages, returns the admin """
+        admin = self._clients['admin'][admin_id]
+        Log.debug(f"Removing all messages from kafka cluster for message " \
+            f"type {message_type} with admin id {admin_id}")
+
+        if message_type not in self._saved_retention:
+            self._save_retention(admin, message_type)
+        self._set_retention(admin, message_type, \
+            self._min_msg_retention_period, errors.ERR_OP_FAILED, \
+            "Purging messages failed for message type %s")
+        return admin
+
+    def _restore_retention(self, admin: object, message_type: str):
+        """ Restores the retention saved before purge """
+        self._set_retention(admin, message_type, \
+            self._saved_retention[message_type], errno.ENOKEY, \
+            "Unknown configuration for message type %s.")
+        Log.debug(f"Successfully deleted all the messages of message_type: " \
+            f"{message_type}")
+
     def delete(self, admin_id: str, message_type: str):
         """
         Deletes all the messages of given message_type
@@ -353,55 +682,34 @@ class KafkaMessageBroker(MessageBroker):
         message_type    This is essentially equivalent to the
                         queue/topic name. For e.g. "Alert"
         """
-        admin = self._clients['admin'][admin_id]
-        Log.debug(f"Removing all messages from kafka cluster for message " \
-            f"type {message_type} with admin id {admin_id}")
-
-        for tuned_retry in range(self._max_config_retry_count):
-            self._resource.set_config('retention.ms', \
-                self._min_msg_retention_period)
-            tuned_params = admin.alter_configs([self._resource])
-            if list(tuned_params.values())[0].result() is not None:
-                if tuned_retry > 1:
-                    Log.error(f"MessageBusError: {errors.ERR_OP_FAILED} " \
-                        f"alter_configs() for resource {self._resource} " \
-                        f"failed using admin {admin} for message type " \
-                        f"{message_type}")
-                    raise MessageBusError(errors.ERR_OP_FAILED, \
-                        "alter_configs() for resource %s failed using admin" +\
-                        "%s for message type %s", self._resource, admin,\
-                        message_type)
-                continue
-            else:
-                break
-
+        admin = self._purge_messages(admin_id, message_type)
         # Sleep for a second to delete the messages
         time.sleep(1)
+        self._restore_retention(admin, message_type)
+        return 0
 
-        for default_retry in range(self._max_config_retry_count):
-            self._resource.set_config('retention.ms', self._saved_retention)
-            default_params = admin.alter_configs([self._resource])
-            if list(default_params.values())[0].result() is not None:
-                if default_retry > 1:
-                    Log.error(f"MessageBusError: {errno.ENOKEY} Unknown " \
-                        f"configuration for message type {message_type}.")
-                    raise MessageBusError(errno.ENOKEY, "Unknown " +\
-                        "configuration for message type %s.", message_type)
-                continue
-            else:
-                break
-        Log.debug(f"Successfully deleted all the messages of message_type: " \
-            f"{message_type}")
+    async def delete_async(self, admin_id: str, message_type: str):
+        """ Deletes all the messages of given message_type, see delete """
+        admin = await self._run_blocking(self._purge_messages, admin_id, \
+            message_type)
+        await asyncio.sleep(1)
+        await self._run_blocking(self._restore_retention, admin, message_type)
         return 0
 
-    def receive(self, consumer_id: str, timeout: float = None) -> list:
+    def receive(self, consumer_id: str, timeout: float = None, \
+        batch_size: int = 1, max_wait: float = None) -> list:
         """
         Receives list of messages from Kafka Message Server
 
         Parameters:
         consumer_id     Consumer ID for which messages are to be retrieved
         timeout         Time in seconds to wait for the message. Timeout of 0
-                        will lead to blocking indefinitely for the message
+                        will lead to blocking for the message, until max_wait
+        batch_size      Maximum number of messages to be received at once.
+                        A single message is returned for 1 (default), a list
+                        of messages otherwise
+        max_wait        Time in seconds after which None is returned even when
+                        blocking. Blocks indefinitely if not specified
         """
         blocking = False
 
@@ -420,22 +728,24 @@ class KafkaMessageBroker(MessageBroker):
             timeout = self._recv_message_timeout
             blocking = True
 
+        deadline = None if max_wait is None else time.monotonic() + max_wait
         try:
             while True:
-                msg = consumer.poll(timeout=timeout)
-                if msg is None:
-                    # if blocking (timeout=0), NoneType messages are ignored
-                    if not blocking:
-                        return None
-                elif msg.error():
-                    Log.error(f"MessageBusError: {errors.ERR_OP_FAILED}" \
-                        f" poll({timeout}) for consumer {consumer_id} failed" \
-                        f" to receive message. {msg.error()}")
-                    raise MessageBusError(errors.ERR_OP_FAILED, "poll(%s) " +\
-                        "for consumer %s failed to receive message. %s", \
-                        timeout, consumer_id, msg.error())
-                else:
-                    return msg.value()
+                wait = timeout if deadline is None else \
+                    max(0, min(timeout, deadline - time.monotonic()))
+                msgs = consumer.consume(num_messages=batch_size, timeout=wait)
+                if msgs and len(msgs) < batch_size:
+                    # Drain what is already fetched without waiting again
+                    msgs.extend(consumer.consume(num_messages=batch_size - \
+                        len(msgs), timeout=0))
+                if msgs:
+                    return self._get_message_values(consumer_id, msgs, \
+                        batch_size, timeout)
+                # if blocking (timeout=0), empty batches are ignored
+                if not blocking:
+                    return None
+                if deadline is not None and time.monotonic() >= deadline:
+                    return None
         except KeyboardInterrupt:
             Log.error(f"MessageBusError: {errno.EINTR} Received Keyboard " \
                 f"interrupt while trying to receive message for consumer " \
@@ -443,6 +753,72 @@ class KafkaMessageBroker(MessageBroker):
             raise MessageBusError(errno.EINTR, "Received Keyboard interrupt " +\
                 "while trying to receive message for consumer %s", consumer_id)
 
+    @staticmethod
+    def _get_message_values(consumer_id: str, msgs: list, batch_size: int, \
+        timeout: float):
+        """
+        Value of the consumed message or list of values for a batch. Errored
+        entries are skipped, so messages consumed along with them are not lost
+        """
+        values = []
+        error = None
+        for msg in msgs:
+            if msg.error():
+                Log.error(f"MessageBusError: {errors.ERR_OP_FAILED}" \
+                    f" consume({timeout}) for consumer {consumer_id}" \
+                    f" failed to receive message. {msg.error()}")
+                error = error or msg.error()
+                continue
+            values.append(msg.value())
+        if not values:
+            raise MessageBusError(errors.ERR_OP_FAILED, \
+                "consume(%s) for consumer %s failed to receive " +\
+                "message. %s", timeout, consumer_id, error)
+        if batch_size == 1:
+            return values[0]
+        return values
+
+    async def receive_async(self, consumer_id: str, timeout: float = None, \
+        batch_size: int = 1) -> list:
+        """
+        Receives list of messages from Kafka Message Server without blocking
+        the event loop. The consumer is checked without waiting and the
+        coroutine sleeps (with backoff) in between, so it can be cancelled
+        without losing a consumed message
+
+        Parameters:
+        consumer_id     Consumer ID for which messages are to be retrieved
+        timeout         Time in seconds to wait for the message. Timeout of 0
+                        will lead to waiting indefinitely for the message
+        batch_size      Maximum number of messages to be received at once.
+                        A single message is returned for 1 (default), a list
+                        of messages otherwise
+        """
+        consumer = self._clients['consumer'][consumer_id]
+        if consumer is None:
+            Log.error(f"MessageBusError: {errors.ERR_SERVICE_NOT_INITIALIZED}"\
+                f" Consumer {consumer_id} is not initialized.")
+            raise MessageBusError(errors.ERR_SERVICE_NOT_INITIALIZED, \
+                "Consumer %s is not initialized.", consumer_id)
+
+        if timeout is None:
+            timeout = self._recv_message_timeout
+        loop = asyncio.get_event_loop()
+        deadline = None if timeout == 0 else loop.time() + timeout
+        delay = self._receive_retry_initial_delay
+        while True:
+            msgs = consumer.consume(num_messages=batch_size, timeout=0)
+            if msgs:
+                return self._get_message_values(consumer_id, msgs, \
+                    batch_size, timeout)
+            if deadline is not None:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    return None
+                delay = min(delay, remaining)
+            await asyncio.sleep(delay)
+            delay = min(delay*2, self._receive_retry_max_delay)
+
     def ack(self, consumer_id: str):
         """ To manually commit offset """
         consumer = self._clients['consumer'][consumer_id]
@@ -451,7 +827,10 @@ class KafkaMessageBroker(MessageBroker):
                 f" Consumer {consumer_id} is not initialized.")
             raise MessageBusError(errors.ERR_SERVICE_NOT_INITIALIZED,\
                 "Consumer %s is not initialized.", consumer_id)
-        consumer.commit(async=False)
+        # Offsets are already committed by the consumer itself
+        if self._auto_ack.get(consumer_id):
+            return
+        consumer.commit(asynchronous=False)
 
     def _configure_message_type(self, admin_id: str, message_type: str, **kwargs):
         """
@@ -466,39 +845,67 @@ class KafkaMessageBroker(MessageBroker):
         data_limit_bytes This should be the max size of log files
                          for individual message_type.
         """
+        return self.configure_message_types(admin_id, [(message_type, kwargs)])
+
+    def configure_message_types(self, admin_id: str, entries: list):
+        """
+        Applies configuration of many message types with a single request
+
+        Parameters:
+        admin_id        A String that represents Admin client ID.
+        entries         List of (message_type, configuration) tuples, where
+                        configuration is a dict having keys expire_time_ms,
+                        data_limit_bytes or file_delete_ms.
+                        For e.g. [("Alert", {"expire_time_ms": 1000})]
+        """
         admin = self._clients['admin'][admin_id]
-        Log.debug(f"New configuration for message " \
-            f"type {message_type} with admin id {admin_id}")
-        # check for message_type exist or not
-        message_type_list = self.list_message_types(admin_id)
-        if message_type not in message_type_list:
-            raise MessageBusError(errno.ENOENT, "Unknown Message type:"+\
-                " not listed in %s", message_type_list)
-        topic_resource = ConfigResource('topic', message_type)
-        for tuned_retry in range(self._max_config_retry_count):
-            for key, val in kwargs.items():
+        message_types = [message_type for message_type, _ in entries]
+        if Log.is_enabled_for(Log.DEBUG):
+            Log.debug(f"New configuration for message types " \
+                f"{message_types} with admin id {admin_id}")
+        if len(set(message_types)) != len(message_types):
+            raise MessageBusError(errno.EINVAL, "Duplicate message_type in " +\
+                "%s, configuration of a message type must be in one entry.", \
+                message_types)
+        for message_type, configs in entries:
+            for key in configs:
                 if key not in self._config_prop_map:
                     raise MessageBusError(errno.EINVAL,\
                         "Invalid configuration %s for message_type %s.", key,\
                         message_type)
-                topic_resource.set_config(self._config_prop_map[key], val)
-            tuned_params = admin.alter_configs([topic_resource])
-            if list(tuned_params.values())[0].result() is not None:
-                if tuned_retry > 1:
-                    Log.error(f"MessageBusError: {errors.ERR_OP_FAILED} " \
-                        f"Updating message type expire time by "\
-                        f"alter_configs() for resource {topic_resource} " \
-                        f"failed using admin {admin} for message type " \
-                        f"{message_type}")
-                    raise MessageBusError(errors.ERR_OP_FAILED, \
-                        "Updating message type expire time by "+\
-                        "alter_configs() for resource %s failed using admin" +\
-                        "%s for message type %s", topic_resource, admin,\
-                        message_type)
-                continue
-            else:
+        # check for message_type exist or not
+        message_type_metadata = self._get_metadata(admin)
+        topic_resources = []
+        for message_type, configs in entries:
+            if message_type not in message_type_metadata:
+                raise MessageBusError(errno.ENOENT, "Unknown Message type:"+\
+                    " not listed in %s", list(message_type_metadata))
+            topic_resources.append(ConfigResource('topic', message_type, \
+                set_config={self._config_prop_map[key]: val for key, val in \
+                configs.items()}))
+
+        for tuned_retry in range(self._max_config_retry_count):
+            tuned_params = admin.alter_configs(topic_resources)
+            # Retry only the message types which are not yet configured
+            topic_resources = []
+            for topic_resource, task in tuned_params.items():
+                try:
+                    task.result()
+                except KafkaException as e:
+                    topic_resources.append(topic_resource)
+                    failure = e
+            if not topic_resources:
                 break
-        Log.debug("Successfully updated message type with new"+\
+            if tuned_retry > 1:
+                Log.error(f"MessageBusError: {errors.ERR_OP_FAILED} " \
+                    f"Updating message type configuration by "\
+                    f"alter_configs() for resources {topic_resources} " \
+                    f"failed using admin {admin}. {failure}")
+                raise MessageBusError(errors.ERR_OP_FAILED, \
+                    "Updating message type configuration by "+\
+                    "alter_configs() for resources %s failed using admin" +\
+                    " %s. %s", topic_resources, admin, failure)
+        Log.debug("Successfully updated message types with new"+\
             " configuration.")
         return 0
 
@@ -516,7 +923,7 @@ class KafkaMessageBroker(MessageBroker):
             f"type {message_type} with admin id {admin_id}")
 
         for config_property in ['expire_time_ms', 'data_limit_bytes']:
-            if config_property not in kwargs.keys():
+            if config_property not in kwargs:
                 raise MessageBusError(errno.EINVAL,\
                     "Invalid message_type retention config key %s.", config_property)
         kwargs['file_delete_ms'] = 1
@@ -34,7 +34,13 @@ class MessageBus(metaclass=Singleton):
 
     @staticmethod
     def init(message_server_endpoints: list, **message_server_params_kwargs: dict):
-        """Initialize MessageBus and load its broker."""
+        """
+        Initialize MessageBus and load its broker.
+
+        Optional producer in message_server_params_kwargs tunes the producers
+        with keys linger_ms (default 20), batch_num_messages (default 10000),
+        compression_type (default lz4) and queue_buffering_max_kbytes.
+        """
         utils_index = 'utils_ind'
         Conf.load(utils_index, 'dict:{}', skip_reload=True)
         message_server_keys = message_server_params_kwargs.keys()
@@ -57,6 +63,9 @@ class MessageBus(metaclass=Singleton):
             socket_timeout)
         Conf.set(utils_index, 'message_broker>message_bus>send_timeout', \
             send_timeout)
+        if 'producer' in message_server_keys:
+            Conf.set(utils_index, 'message_broker>message_bus>producer', \
+                message_server_params_kwargs['producer'])
         Conf.save(utils_index)
 
         broker_conf = Conf.get(utils_index, 'message_broker')
@@ -93,11 +102,25 @@ class MessageBus(metaclass=Singleton):
         MessageBus._broker.register_message_type(client_id, message_types, \
             partitions)
 
+    @staticmethod
+    async def register_message_type_async(client_id: str, \
+        message_types: list, partitions: int):
+        """Registers list of message types without blocking the event loop."""
+        await MessageBus._broker.register_message_type_async(client_id, \
+            message_types, partitions)
+
     @staticmethod
     def deregister_message_type(client_id: str, message_types: list):
         """Deregisters list of message types in the configured message broker."""
         MessageBus._broker.deregister_message_type(client_id, message_types)
 
+    @staticmethod
+    async def deregister_message_type_async(client_id: str, \
+        message_types: list):
+        """Deregisters list of message types without blocking the event loop."""
+        await MessageBus._broker.deregister_message_type_async(client_id, \
+            message_types)
+
     @staticmethod
     def add_concurrency(client_id: str, message_type: str, \
         concurrency_count: int):
@@ -105,6 +128,13 @@ class MessageBus(metaclass=Singleton):
         MessageBus._broker.add_concurrency(client_id, message_type, \
             concurrency_count)
 
+    @staticmethod
+    async def add_concurrency_async(client_id: str, message_type: str, \
+        concurrency_count: int):
+        """To achieve concurrency among consumers in asyncio."""
+        await MessageBus._broker.add_concurrency_async(client_id, \
+            message_type, concurrency_count)
+
     @staticmethod
     def send(client_id: str, message_type: str, method: str, messages: list):
         """Sends list of messages to the configured message broker."""
@@ -116,15 +146,40 @@ class MessageBus(metaclass=Singleton):
         return MessageBus._broker.delete(client_id, message_type)
 
     @staticmethod
-    def receive(client_id: str, timeout: float = None) -> list:
+    async def delete_async(client_id: str, message_type: str):
+        """Deletes all the messages without blocking the event loop."""
+        return await MessageBus._broker.delete_async(client_id, message_type)
+
+    @staticmethod
+    def receive(client_id: str, timeout: float = None, \
+        batch_size: int = 1, max_wait: float = None) -> list:
         """Receives messages from the configured message broker."""
-        return MessageBus._broker.receive(client_id, timeout)
+        return MessageBus._broker.receive(client_id, timeout, batch_size, \
+            max_wait)
+
+    @staticmethod
+    async def receive_async(client_id: str, timeout: float = None, \
+        batch_size: int = 1) -> list:
+        """Receives messages from the configured message broker in asyncio."""
+        return await MessageBus._broker.receive_async(client_id, timeout, \
+            batch_size)
 
     @staticmethod
     def ack(client_id: str):
         """Provides acknowledgement on offset."""
         MessageBus._broker.ack(client_id)
 
+    @staticmethod
+    def configure_message_types(client_id: str, entries: list):
+        """Configures list of message types with a single request."""
+        return MessageBus._broker.configure_message_types(client_id, entries)
+
+    @staticmethod
+    def close():
+        """Releases the background resources of the message broker."""
+        if MessageBus._broker is not None:
+            MessageBus._broker.close()
+
     @staticmethod
     def set_message_type_expire(client_id: str, message_type: str,\
         **kwargs):
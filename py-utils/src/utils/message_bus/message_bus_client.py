@@ -58,6 +58,13 @@ class MessageBusClient:
         client_id = self._get_conf('client_id')
         MessageBus.register_message_type(client_id, message_types, partitions)
 
+    async def register_message_type_async(self, message_types: list, \
+        partitions: int):
+        """ Registers a list of message types, see register_message_type """
+        client_id = self._get_conf('client_id')
+        await MessageBus.register_message_type_async(client_id, \
+            message_types, partitions)
+
     def deregister_message_type(self, message_types: list):
         """
         Deregisters a list of message types
@@ -69,6 +76,12 @@ class MessageBusClient:
         client_id = self._get_conf('client_id')
         MessageBus.deregister_message_type(client_id, message_types)
 
+    async def deregister_message_type_async(self, message_types: list):
+        """ Deregisters a list of message types, see deregister_message_type """
+        client_id = self._get_conf('client_id')
+        await MessageBus.deregister_message_type_async(client_id, \
+            message_types)
+
     def add_concurrency(self, message_type: str, concurrency_count: int):
         """
         To achieve concurrency for a message type
@@ -82,9 +95,16 @@ class MessageBusClient:
         MessageBus.add_concurrency(client_id, message_type, \
             concurrency_count)
 
+    async def add_concurrency_async(self, message_type: str, \
+        concurrency_count: int):
+        """ To achieve concurrency for a message type, see add_concurrency """
+        client_id = self._get_conf('client_id')
+        await MessageBus.add_concurrency_async(client_id, message_type, \
+            concurrency_count)
+
     @staticmethod
     def _get_str_message_list(messages: list) -> list:
-        """ Convert the format of message to string """
+        """ Convert the format of message to string, bytes are kept as is """
         from cortx.utils.kv_store import KvPayload
 
         message_list = []
@@ -92,9 +112,9 @@ class MessageBusClient:
             if isinstance(message, KvPayload):
                 message = message.json
 
-            if not isinstance(message, str):
+            if not isinstance(message, (str, bytes, bytearray, memoryview)):
                 raise MessageBusError(errno.EINVAL, "Invalid message format, \
-                    not of type KvPayload or str. %s", message)
+                    not of type KvPayload, str or bytes. %s", message)
             message_list.append(message)
         return message_list
 
@@ -103,7 +123,8 @@ class MessageBusClient:
         Sends list of messages to the Message Bus
 
         Parameters:
-        messages     A list of messages sent to Message Bus
+        messages     A list of messages sent to Message Bus. Messages can be
+                     pre-encoded to bytes when the same payload is reused
         """
         message_type = self._get_conf('message_type')
         method = self._get_conf('method')
@@ -117,6 +138,12 @@ class MessageBusClient:
         client_id = self._get_conf('client_id')
         return MessageBus.delete(client_id, message_type)
 
+    async def delete_async(self):
+        """ Deletes the messages without blocking the event loop """
+        message_type = self._get_conf('message_type')
+        client_id = self._get_conf('client_id')
+        return await MessageBus.delete_async(client_id, message_type)
+
     def set_message_type_expire(self, message_type: str, **kwargs):
         """Set expiration time for given message type."""
         client_id = self._get_conf('client_id')
@@ -126,15 +153,44 @@ class MessageBusClient:
             " configuration.")
         return status
 
-    def receive(self, timeout: float = None) -> list:
+    def configure_message_types(self, entries: list):
+        """
+        Configures a list of message types at once
+
+        Parameters:
+        entries     List of (message_type, configuration) tuples.
+                    For e.g. [("Alert", {"expire_time_ms": 1000})]
+        """
+        client_id = self._get_conf('client_id')
+        return MessageBus.configure_message_types(client_id, entries)
+
+    def receive(self, timeout: float = None, batch_size: int = 1, \
+        max_wait: float = None) -> list:
         """
         Receives messages from the Message Bus
 
         Parameters:
         timeout     Time in seconds to wait for the message.
+        batch_size  Maximum number of messages to be received at once, a list
+                    of messages is returned when it is more than 1.
+        max_wait    Time in seconds after which None is returned even if
+                    blocking (timeout of 0).
+        """
+        client_id = self._get_conf('client_id')
+        return MessageBus.receive(client_id, timeout, batch_size, max_wait)
+
+    async def receive_async(self, timeout: float = None, \
+        batch_size: int = 1) -> list:
+        """
+        Receives messages from the Message Bus without blocking the event loop
+
+        Parameters:
+        timeout     Time in seconds to wait for the message.
+        batch_size  Maximum number of messages to be received at once, a list
+                    of messages is returned when it is more than 1.
         """
         client_id = self._get_conf('client_id')
-        return MessageBus.receive(client_id, timeout)
+        return await MessageBus.receive_async(client_id, timeout, batch_size)
 
     def ack(self):
         """ Provides acknowledgement on offset """
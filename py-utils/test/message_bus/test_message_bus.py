@@ -213,6 +213,108 @@ class TestMessageBus(unittest.TestCase):
         message = TestMessageBus._consumer.receive()
         self.assertEqual(message, b'A simple test message')
 
+    def test_016_receive_batch(self):
+        """Test receive messages in batches."""
+        messages = []
+        for msg_num in range(0, TestMessageBus._bulk_count):
+            messages.append("Test Message " + str(msg_num))
+        TestMessageBus._producer.send(messages)
+        count = 0
+        while True:
+            batch = TestMessageBus._consumer.receive(batch_size=\
+                TestMessageBus._receive_limit)
+            if batch is None:
+                break
+            self.assertLessEqual(len(batch), TestMessageBus._receive_limit)
+            count += len(batch)
+        self.assertEqual(count, TestMessageBus._bulk_count)
+
+    def test_017_receive_async(self):
+        """Test receive message in asyncio."""
+        import asyncio
+        TestMessageBus._producer.send(["A simple test message"])
+        message = asyncio.run(TestMessageBus._consumer.receive_async())
+        self.assertEqual(message, b'A simple test message')
+
+    def test_018_async_admin(self):
+        """Test register and deregister message type in asyncio."""
+        import asyncio
+        asyncio.run(TestMessageBus._admin.register_message_type_async(\
+            message_types=['test_async_msg_type'], partitions=1))
+        self.assertIn('test_async_msg_type', \
+            TestMessageBus._admin.list_message_types())
+        asyncio.run(TestMessageBus._admin.deregister_message_type_async(\
+            ['test_async_msg_type']))
+        self.assertNotIn('test_async_msg_type', \
+            TestMessageBus._admin.list_message_types())
+
+    def test_019_receive_blocking_max_wait(self):
+        """Test blocking receive returns after max_wait."""
+        start = time.time()
+        message = TestMessageBus._consumer.receive(timeout=0, max_wait=3)
+        self.assertIsNone(message)
+        self.assertLess(time.time() - start, 3 + 1)
+
+    def test_020_close(self):
+        """Test producer can be initialized again after close."""
+        MessageBus.close()
+        with self.assertRaises(MessageBusError):
+            TestMessageBus._producer.send(["A simple test message"])
+        producer = MessageProducer(producer_id='send', \
+            message_type=TestMessageBus._message_type, method='sync')
+        producer.send(["A simple test message"])
+        # Existing handle of the same producer id works again
+        TestMessageBus._producer.send(["A simple test message"])
+        for _ in range(2):
+            TestMessageBus._consumer.receive()
+
+    def test_021_ack_auto_ack_consumer(self):
+        """Test ack on a consumer committing offsets automatically."""
+        consumer = MessageConsumer(consumer_id='auto_ack', \
+            consumer_group='auto_ack', message_types=\
+            [TestMessageBus._message_type], auto_ack=True, offset='earliest')
+        message = consumer.receive(timeout=0, max_wait=10)
+        self.assertIsNotNone(message, "Message not found")
+        consumer.ack()
+
+    def test_022_send_bytes(self):
+        """Test send pre-encoded bytes and memoryview messages."""
+        TestMessageBus._producer.send([b'A bytes test message', \
+            memoryview(b'A memoryview test message')])
+        messages = TestMessageBus._consumer.receive(batch_size=2, \
+            timeout=0, max_wait=10)
+        self.assertIsNotNone(messages, "Message not found")
+        if len(messages) < 2:
+            messages.append(TestMessageBus._consumer.receive(timeout=0, \
+                max_wait=10))
+        self.assertEqual(messages, [b'A bytes test message', \
+            b'A memoryview test message'])
+
+    def test_023_configure_message_types(self):
+        """Test configure multiple message types at once."""
+        TestMessageBus._admin.register_message_type(message_types=\
+            ['test_configure_msg_type'], partitions=1)
+        TestMessageBus._admin.configure_message_types([\
+            (TestMessageBus._message_type, {'expire_time_ms': 100000}), \
+            ('test_configure_msg_type', {'expire_time_ms': 200000, \
+            'data_limit_bytes': 20000})])
+        with self.assertRaises(MessageBusError):
+            TestMessageBus._admin.configure_message_types([\
+                (TestMessageBus._message_type, {'expire_time_ms': 100000}), \
+                (TestMessageBus._message_type, {'data_limit_bytes': 20000})])
+        TestMessageBus._admin.deregister_message_type(\
+            ['test_configure_msg_type'])
+
+    def test_024_invalid_producer_conf(self):
+        """Test unknown producer configuration is rejected."""
+        from cortx.utils.message_bus.message_broker_collection import \
+            KafkaMessageBroker
+        broker_conf = {'cluster': [{'server': 'localhost', 'port': '9092'}], \
+            'message_bus': {'receive_timeout': 2, 'socket_timeout': 15000, \
+            'send_timeout': 5000, 'producer': {'linger': 20}}}
+        with self.assertRaises(MessageBusError):
+            KafkaMessageBroker(broker_conf)
+
     @classmethod
     def tearDownClass(cls):
         """Deregister the test message_type."""